@@ -2,20 +2,28 @@ import argparse
 import os
 from datetime import date
 
+import numpy as np
 import pandas as pd
 
 from src.providers_yahoo import YahooProvider
 from src.data_loader import add_moving_averages
 from src.indicators import add_returns, add_rolling_volatility
+from src.lookback import plan_lookback
+from src.feature_cache import FeatureCache
+
+# Bump whenever build_features / add_label / the indicator windows change,
+# so cached feature frames from older code are not reused
+FEATURES_VERSION = 1
 
 
 def parse_args():
     p = argparse.ArgumentParser(description="Week 3: Build ML dataset from tickers")
     p.add_argument("--tickers", nargs="+", required=True, help="Tickers e.g. AAPL MSFT BHP.AX")
-    p.add_argument("--period", default="2y", help="History window: 6mo, 1y, 2y, 5y...")
+    p.add_argument("--period", default=None, help="History window: 6mo, 1y, 2y, 5y... Default: planned from features + --horizon + --min_rows")
     p.add_argument("--interval", default="1d", help="Data interval: 1d recommended")
     p.add_argument("--horizon", type=int, default=5, help="Future return horizon in days for label")
     p.add_argument("--min_rows", type=int, default=260, help="Minimum rows required per ticker")
+    p.add_argument("--no_cache", action="store_true", help="Recompute features even if cached")
     return p.parse_args()
 
 
@@ -43,6 +51,66 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+# Per-date cross-sectional context: where each ticker sits among all tickers that day
+CROSS_SECTIONAL_COLS = ("return_5d", "vol20", "ma50_ratio")
+
+
+def _grouped_pct_rank(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Percentile rank of each value within its group (same result as groupby().rank(pct=True),
+    ties averaged, NaN stays NaN), from one sort over (group, value) instead of a sort per group.
+    """
+    out = np.full(len(values), np.nan)
+    valid = ~np.isnan(values)
+    v, c = values[valid], codes[valid]
+    if len(v) == 0:
+        return out
+
+    # Sort by value, then stable-sort by group; small integer group codes get numpy's radix sort
+    order = np.argsort(v)
+    order = order[np.argsort(c[order].astype(np.min_scalar_type(n_groups)), kind="stable")]
+    vs, cs = v[order], c[order]
+    counts = np.bincount(cs, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    pos = np.arange(1, len(vs) + 1) - starts[cs]  # 1-based position inside the group
+
+    # Runs of equal values inside a group share the average of their positions
+    new_run = np.ones(len(vs), dtype=bool)
+    new_run[1:] = (cs[1:] != cs[:-1]) | (vs[1:] != vs[:-1])
+    run_starts = np.flatnonzero(new_run)
+    run_ends = np.append(run_starts[1:], len(vs)) - 1
+    avg = (pos[run_starts] + pos[run_ends]) / 2.0
+
+    ranked = np.empty(len(vs))
+    ranked[order] = avg[np.cumsum(new_run) - 1] / counts[cs]
+    out[valid] = ranked
+    return out
+
+
+def add_cross_sectional_features(dataset: pd.DataFrame, cols=CROSS_SECTIONAL_COLS) -> pd.DataFrame:
+    """
+    Adds <col>_cs_rank (percentile rank among tickers on the same date, 0-1]
+    and <col>_cs_z (z-score among tickers on the same date) for each col.
+    Works on the stacked panel: dates are factorized once, ranks come from a single
+    sort per column and mean/std from grouped transforms, so there is no loop over dates.
+    Dates with a single ticker get z = 0.
+    """
+    out = dataset.copy()
+    cols = [c for c in cols if c in out.columns]
+    codes, uniques = pd.factorize(out["date"])
+
+    by_date = out[cols].groupby(codes, sort=False)
+    mean = by_date.transform("mean")
+    std = by_date.transform("std")
+    z = (out[cols] - mean) / std.where(std > 0)
+    z = z.mask(out[cols].notna() & ~(std > 0), 0.0)
+
+    for c in cols:
+        out[f"{c}_cs_rank"] = _grouped_pct_rank(out[c].to_numpy(dtype=np.float64), codes, len(uniques))
+        out[f"{c}_cs_z"] = z[c]
+    return out
+
+
 def add_label(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
     """
     Label = 1 if future return over `horizon` days is positive else 0.
@@ -53,14 +121,54 @@ def add_label(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
     return out
 
 
+def compute_ticker_features(df: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    """
+    Price history -> final feature + label rows for one ticker (NaN rows dropped).
+    """
+    # Add indicators
+    df = add_moving_averages(df, windows=(20, 50))
+    df = add_returns(df)
+    df = add_rolling_volatility(df, window=20)
+
+    # Features + label
+    df = build_features(df)
+    df = add_label(df, horizon=horizon)
+
+    # Select final columns
+    final = df[[
+        "Close",
+        "ma20_ratio",
+        "ma50_ratio",
+        "return_1d",
+        "return_5d",
+        "vol20",
+        "future_return",
+        "label",
+    ]].copy()
+
+    # Drop rows with NaNs created by rolling windows / shifts
+    return final.dropna()
+
+
 def main():
     args = parse_args()
     provider = YahooProvider()
 
+    # Features need MA50, Volatility20 (21 closes) and return_5d (6 closes); the label needs --horizon more
+    start = None
+    if args.period is None:
+        plan = plan_lookback(windows=(50, 21, 6), horizon=args.horizon, min_rows=args.min_rows, interval=args.interval)
+        start = plan.start
+        print(f"Planned lookback: {plan.describe()}")
+
+    cache = None if args.no_cache else FeatureCache()
+    spec = {"features": "build_dataset", "windows": [20, 50], "vol_window": 20,
+            "horizon": args.horizon, "version": FEATURES_VERSION}
+
     rows = []
 
     for ticker in args.tickers:
-        df = provider.get_price_data(ticker, period=args.period, interval=args.interval)
+        df = provider.get_price_data(ticker, period=args.period, interval=args.interval, start=start)
 
         if df is None or df.empty or len(df) < args.min_rows:
             print(f"Skipping {ticker}: not enough data (rows={0 if df is None else len(df)})")
@@ -71,42 +179,33 @@ def main():
             print(f"Skipping {ticker}: Close column missing")
             continue
 
-        # Add indicators
-        df = add_moving_averages(df, windows=(20, 50))
-        df = add_returns(df)
-        df = add_rolling_volatility(df, window=20)
-
-        # Features + label
-        df = build_features(df)
-        df = add_label(df, horizon=args.horizon)
-
-        # Select final columns
-        final = df[[
-            "Close",
-            "ma20_ratio",
-            "ma50_ratio",
-            "return_1d",
-            "return_5d",
-            "vol20",
-            "future_return",
-            "label",
-        ]].copy()
+        if cache is None:
+            final = compute_ticker_features(df, horizon=args.horizon)
+        else:
+            final = cache.get_or_compute(
+                df, spec, lambda d: compute_ticker_features(d, horizon=args.horizon)
+            )
 
         # Add identifiers
+        final = final.copy()
         final["ticker"] = ticker
         final["date"] = final.index
 
-        # Drop rows with NaNs created by rolling windows / shifts
-        final = final.dropna()
-
         rows.append(final)
 
+    if cache is not None:
+        print(f"Feature cache: {cache.hits} reused, {cache.misses} computed")
+
     if not rows:
         print("No data produced. (Yahoo blocked? or tickers invalid?)")
         return
 
     dataset = pd.concat(rows, axis=0, ignore_index=True)
 
+    # Cross-sectional rank / z-score per date
+    dataset = add_cross_sectional_features(dataset)
+    cs_cols = [f"{c}_cs_{kind}" for c in CROSS_SECTIONAL_COLS for kind in ("rank", "z")]
+
     # Reorder columns
     dataset = dataset[[
         "ticker",
@@ -117,6 +216,7 @@ def main():
         "return_1d",
         "return_5d",
         "vol20",
+        *cs_cols,
         "future_return",
         "label",
     ]]
@@ -1,10 +1,14 @@
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
 from src.data_loader import get_price_data, add_moving_averages
 from src.indicators import add_returns, add_rolling_volatility
 from src.providers_yahoo import YahooProvider
 from src.plotter import plot_price_with_mas, plot_volume
 from src.summary import generate_basic_summary
+from src.lookback import plan_lookback
 
 # later:
 # from src.providers_alpha import AlphaVantageProvider
@@ -14,25 +18,25 @@ from src.summary import generate_basic_summary
 # python cli.py CTT.AX
 # python cli.py CTT.AX --period 1y
 # python cli.py CTT.AX --windows 10 20 50 --rows 10
+# python cli.py AAPL MSFT TSLA --summary --out data/watchlist.csv
 
 
 # extras
 # Add a --plot option to show chart
-# Add support for multiple tickers in one command (python cli.py AAPL MSFT TSLA)
-# Save output to CSV (--out data/AAPL.csv)
 
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Financial AI - Stock Downloader + Moving Averages (Week 1 CLI)"
     )
     parser.add_argument(
-        "ticker",
-        help="Stock ticker (e.g., AAPL, TSLA, BHP.AX, CBA.AX)"
+        "tickers",
+        nargs="+",
+        help="One or more stock tickers (e.g., AAPL TSLA BHP.AX CBA.AX)"
     )
     parser.add_argument(
         "--period",
-        default="1y",
-        help="Data period (e.g., 6mo, 1y, 2y, 5y). Default: 1y"
+        default=None,
+        help="Data period (e.g., 6mo, 1y, 2y, 5y). Default: just enough bars for --windows"
     )
     parser.add_argument(
         "--interval",
@@ -67,29 +71,42 @@ def parse_args():
         action="store_true",
         help="Print a plain-English rule-based summary"
     )
-    return parser.parse_args()
 
-def main():
-    args = parse_args()
-
-    print(f"Downloading {args.ticker} (period={args.period}, interval={args.interval})...")
+    # python cli.py AAPL MSFT TSLA --out data/watchlist.parquet
+    parser.add_argument(
+        "--out",
+        default=None,
+        help="Save all tickers to one CSV or Parquet file (by extension; Parquet needs pyarrow)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="How many tickers to download at the same time. Default: 8"
+    )
+    return parser.parse_args()
 
-    provider = YahooProvider()
-    # provider = AlphaVantageProvider(api_key=os.getenv("ALPHA_VANTAGE_KEY"))
+def fetch_ticker(provider, ticker: str, args, start: str | None) -> pd.DataFrame:
+    """
+    Download + indicators for one ticker. Runs on a worker thread, so no printing here.
+    """
+    df = provider.get_price_data(ticker, period=args.period, interval=args.interval, start=start)
+    if df is None or df.empty:
+        return pd.DataFrame()
 
-    df = provider.get_price_data(args.ticker, period=args.period, interval=args.interval)
+    df = add_moving_averages(df, windows=tuple(args.windows))
+    df = add_returns(df)
+    df = add_rolling_volatility(df, window=20)
+    return df
 
 
-    # ######
-    # print("ticker arg:", args.ticker, type(args.ticker))
-    # ######
+def print_report(ticker: str, df: pd.DataFrame, args) -> None:
+    print(f"\n===== {ticker} =====")
 
     if df.empty:
         print("❌ No data returned. Check ticker symbol or network.")
         return
 
-    df = add_moving_averages(df, windows=tuple(args.windows))
-
     print("✅ Success. Last rows:")
     print(df.tail(args.rows))
 
@@ -109,26 +126,76 @@ def main():
             if val is not None:
                 print(f"- {col}: {val}")
 
-    df = add_returns(df)
-    df = add_rolling_volatility(df, window=20)
     vol_col = "Volatility20"
-    latest = df.dropna().iloc[-1] if not df.dropna().empty else df.iloc[-1]
     if vol_col in df.columns:
-        # print('___')
-        # print(latest.get(vol_col))
         print(f"- {vol_col}: {latest[vol_col] * 100}%")
-        # print('___')
         # min) error, how do i fix notna?
         # if pd.notna(latest.get(vol_col)):
         #    print(f"- {vol_col}: {latest[vol_col] * 100:.1f}%")
 
     if args.plot:
-        plot_price_with_mas(df, args.ticker, ma_windows=tuple(args.windows))
-        plot_volume(df, args.ticker)
+        plot_price_with_mas(df, ticker, ma_windows=tuple(args.windows))
+        plot_volume(df, ticker)
 
     if args.summary:
         print()
-        print(generate_basic_summary(df, args.ticker))
+        print(generate_basic_summary(df, ticker))
+
+
+def save_combined(frames: dict[str, pd.DataFrame], out_path: str) -> None:
+    """
+    One long table (Ticker, Date, ...) for all tickers; .parquet or anything else as CSV.
+    """
+    combined = pd.concat(
+        [df.assign(Ticker=t).rename_axis("Date").reset_index() for t, df in frames.items()],
+        ignore_index=True,
+    )
+    combined = combined[["Ticker"] + [c for c in combined.columns if c != "Ticker"]]
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if out_path.lower().endswith(".parquet"):
+        combined.to_parquet(out_path, index=False)
+    else:
+        combined.to_csv(out_path, index=False)
+    print(f"✅ Saved {len(frames)} tickers to {out_path}")
+
+
+def main():
+    args = parse_args()
+    tickers = list(dict.fromkeys(args.tickers))  # drop duplicates, keep order
+
+    # No --period: fetch only what the longest MA (and Volatility20, 21 closes) needs
+    start = None
+    if args.period is None:
+        plan = plan_lookback(windows=(*args.windows, 21), interval=args.interval)
+        start = plan.start
+        print(f"Downloading {', '.join(tickers)} ({plan.describe()}, interval={args.interval})...")
+    else:
+        print(f"Downloading {', '.join(tickers)} (period={args.period}, interval={args.interval})...")
+
+    provider = YahooProvider()
+    # provider = AlphaVantageProvider(api_key=os.getenv("ALPHA_VANTAGE_KEY"))
+
+    # Downloads run concurrently; each ticker is printed as soon as its data arrives
+    # (printing/plotting stays on this thread, so output blocks never interleave)
+    frames = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(tickers)))) as pool:
+        futures = {pool.submit(fetch_ticker, provider, t, args, start): t for t in tickers}
+        for fut in as_completed(futures):
+            ticker = futures[fut]
+            try:
+                df = fut.result()
+            except Exception as e:
+                print(f"\n===== {ticker} =====\n❌ {e}")
+                continue
+
+            print_report(ticker, df, args)
+            if not df.empty:
+                frames[ticker] = df
+
+    if args.out and frames:
+        print()
+        save_combined({t: frames[t] for t in tickers if t in frames}, args.out)
 
     print('\n')
 
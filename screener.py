@@ -4,22 +4,75 @@ import os
 
 from src.providers_yahoo import YahooProvider
 from src.data_loader import add_moving_averages
-from src.indicators import add_returns, add_rolling_volatility
+from src.indicators import add_returns, add_rolling_volatility, TRADING_DAYS
+from src.sweep import build_close_panel, run_sweep
+from src.screen_expr import ScreenExpr, run_screen
+from src.lookback import plan_lookback
+from src.feature_cache import FeatureCache
+from src.risk import portfolio_stats, risk_report
+
+# Bump whenever add_indicators changes, so cached indicator frames are not reused
+INDICATORS_VERSION = 1
+
+# --sweep is a backtest over the whole history, so it is not planned down to the warm-up
+SWEEP_DEFAULT_PERIOD = "5y"
+
+
+def positive_int(value: str) -> int:
+    n = int(value)
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return n
 
 
 def parse_args():
     p = argparse.ArgumentParser(description="Week 3: Simple Stock Screener (ASX + US)")
     p.add_argument("--tickers", nargs="+", required=True, help="Tickers e.g. AAPL MSFT BHP.AX CBA.AX")
-    p.add_argument("--period", default="6mo", help="Data period: 1mo, 3mo, 6mo, 1y, 2y ...")
+    p.add_argument("--period", default=None, help="Data period: 1mo, 3mo, 6mo, 1y, 2y ... Default: planned from windows + --min_rows (5y for --sweep)")
     p.add_argument("--interval", default="1d", help="Data interval: 1d, 1h ...")
     p.add_argument("--min_rows", type=int, default=60, help="Minimum rows required to score")
     p.add_argument("--out", default=None, help="Optional CSV output path, e.g. results.csv")
-    return p.parse_args()
+    p.add_argument("--no_cache", action="store_true", help="Recompute indicators even if cached")
+    p.add_argument("--ma_fast", type=int, default=20, help="Fast MA window used for scoring")
+    p.add_argument("--ma_slow", type=int, default=50, help="Slow MA window used for scoring")
+    p.add_argument("--vol_cutoff", type=float, default=0.40, help="Volatility20 above this costs 1 point")
+
+    # python screener.py --tickers AAPL MSFT BHP.AX --period 5y --sweep --sweep_fast 10 20 --sweep_slow 50 100
+    p.add_argument("--sweep", action="store_true", help="Evaluate a grid of MA windows / vol cutoffs over the full history")
+    p.add_argument("--sweep_fast", nargs="+", type=int, default=[10, 20], help="Fast MA windows for --sweep")
+    p.add_argument("--sweep_slow", nargs="+", type=int, default=[50, 100], help="Slow MA windows for --sweep")
+    p.add_argument("--sweep_vol", nargs="+", type=float, default=[0.30, 0.40, 0.50], help="Vol cutoffs for --sweep")
+    p.add_argument("--horizon", type=int, default=5, help="Forward return horizon in days for --sweep")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes for --sweep (default: CPU count)")
+
+    # python screener.py --tickers AAPL MSFT BHP.AX --where "Close > MA50 and Vol20 < 0.3" --score "Ret20 - Vol20"
+    p.add_argument("--where", default=None, help="Filter expression, e.g. \"Close > MA50 and Vol20 < 0.3\"")
+    p.add_argument("--score", default=None, help="Score expression, e.g. \"(Close > MA20) + (Close > MA50) - (Vol20 > 0.4)\"")
+
+    # python screener.py --tickers AAPL MSFT TSLA BHP.AX CBA.AX --period 2y --risk --risk_top 3
+    p.add_argument("--risk", action="store_true", help="Simulate VaR / CVaR / drawdown for an equal-weight basket of the top tickers")
+    p.add_argument("--risk_top", type=positive_int, default=5, help="How many top-scored tickers go into the --risk basket")
+    p.add_argument("--risk_horizons", nargs="+", type=positive_int, default=[1, 5, 21], help="Horizons in trading days for --risk")
+    p.add_argument("--risk_paths", type=positive_int, default=100_000, help="Simulated paths per method for --risk")
+    p.add_argument("--seed", type=int, default=None, help="Random seed for --risk")
+    args = p.parse_args()
+    if args.sweep and args.risk:
+        p.error("--risk needs a ranked screen; it cannot be combined with --sweep")
+    return args
 
 
-def score_ticker(df: pd.DataFrame) -> dict:
+def add_indicators(df: pd.DataFrame, ma_fast: int = 20, ma_slow: int = 50) -> pd.DataFrame:
     """
-    Simple rule-based scoring:
+    MAs + Return + Volatility20, everything score_ticker reads.
+    """
+    df = add_moving_averages(df.copy(), windows=(ma_fast, ma_slow))
+    df = add_returns(df)
+    return add_rolling_volatility(df, window=20)
+
+
+def score_ticker(df: pd.DataFrame, ma_fast: int = 20, ma_slow: int = 50, vol_cutoff: float = 0.40) -> dict:
+    """
+    Simple rule-based scoring (defaults shown, all three are tunable via --sweep):
     +1 if Close > MA20
     +1 if Close > MA50
     +1 if MA20 > MA50
@@ -53,8 +106,9 @@ CBA.AX 151.479996        No        No        No 20.074730      0
     latest = df.dropna().iloc[-1]
 
     close = float(latest["Close"])
-    ma20 = float(latest["MA20"]) if "MA20" in latest else None
-    ma50 = float(latest["MA50"]) if "MA50" in latest else None
+    fast_col, slow_col = f"MA{ma_fast}", f"MA{ma_slow}"
+    ma20 = float(latest[fast_col]) if fast_col in latest else None
+    ma50 = float(latest[slow_col]) if slow_col in latest else None
 
     vol20 = None
     if "Volatility20" in df.columns:
@@ -79,39 +133,175 @@ CBA.AX 151.479996        No        No        No 20.074730      0
         ma20_gt_ma50 = ma20 > ma50
         score += 1 if ma20_gt_ma50 else 0
 
-    if vol20 is not None and vol20 > 0.40:
+    if vol20 is not None and vol20 > vol_cutoff:
         score -= 1
 
     return {
         "Close": close,
-        "AboveMA20": "Yes" if above_ma20 else "No",
-        "AboveMA50": "Yes" if above_ma50 else "No",
-        "MA20>MA50": "Yes" if ma20_gt_ma50 else "No",
+        f"Above{fast_col}": "Yes" if above_ma20 else "No",
+        f"Above{slow_col}": "Yes" if above_ma50 else "No",
+        f"{fast_col}>{slow_col}": "Yes" if ma20_gt_ma50 else "No",
         "Vol20%": (vol20 * 100) if vol20 is not None else None,
         "Score": score,
     }
 
 
+def plan_start(args, windows, horizon: int = 0) -> str | None:
+    """
+    Start date covering `windows` (+ horizon) and --min_rows, or None when --period was given.
+    """
+    if args.period is not None:
+        return None
+    plan = plan_lookback(windows=windows, horizon=horizon, min_rows=args.min_rows, interval=args.interval)
+    print(f"Planned lookback: {plan.describe()}")
+    return plan.start
+
+
+def fetch_frames(args, provider, start: str | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Downloads each ticker once; tickers with errors or fewer than --min_rows rows are skipped.
+    """
+    frames = {}
+    for t in args.tickers:
+        try:
+            df = provider.get_price_data(t, period=args.period, interval=args.interval, start=start)
+        except Exception as e:
+            print(f"Skipping {t}: {e}")
+            continue
+        if df is None or df.empty or len(df) < args.min_rows:
+            print(f"Skipping {t}: not enough data")
+            continue
+        frames[t] = df
+    return frames
+
+
+def sweep(args, provider) -> None:
+    """
+    Downloads each ticker once, then scores the whole parameter grid on a process pool.
+    """
+    if args.period is None:
+        args.period = SWEEP_DEFAULT_PERIOD
+    frames = fetch_frames(args, provider)
+    panel = build_close_panel(frames)
+    out = run_sweep(
+        panel,
+        fast_windows=args.sweep_fast,
+        slow_windows=args.sweep_slow,
+        vol_cutoffs=args.sweep_vol,
+        horizon=args.horizon,
+        workers=args.workers,
+    )
+    if out.empty:
+        print("No sweep results. (no data, or no fast < slow window pairs)")
+        return
+
+    output_path = args.out or os.path.join("outputs", "sweep_results.csv")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    out.to_csv(output_path, index=False)
+    print(f"\n✅ Saved sweep results to {output_path} ({len(frames)} tickers, {len(panel)} dates)")
+    print(out.to_string(index=False))
+
+
+def screen(args, provider) -> None:
+    """
+    Evaluates --where / --score over a snapshot table of the whole universe.
+    With --risk, the basket is the passing tickers in Score order.
+    """
+    # Parse before downloading anything so a typo fails fast
+    try:
+        where = ScreenExpr(args.where) if args.where else None
+        score = ScreenExpr(args.score) if args.score else None
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    lookbacks = [e.lookback for e in (where, score) if e is not None]
+    if args.risk:
+        lookbacks.append(TRADING_DAYS + 1)
+    start = plan_start(args, windows=lookbacks)
+    frames = fetch_frames(args, provider, start=start)
+    out = run_screen(frames, where=where, score=score)
+
+    if out.empty:
+        print("No tickers passed the screen.")
+        return
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        out.to_csv(args.out, index=False)
+        print(f"\n✅ Saved results to {args.out}")
+
+    print(out.to_string(index=False))
+
+    if args.risk:
+        returns_by_ticker = {t: df["Close"].pct_change(fill_method=None) for t, df in frames.items()}
+        print_risk(args, returns_by_ticker, out)
+
+
+def print_risk(args, returns_by_ticker: dict[str, pd.Series], ranked: pd.DataFrame) -> None:
+    """
+    Monte Carlo + bootstrap risk for an equal-weight basket of the --risk_top best tickers.
+    """
+    top = [t for t in ranked["Ticker"] if t in returns_by_ticker][:args.risk_top]
+    if not top:
+        print("\nNo scored tickers for --risk.")
+        return
+
+    returns = pd.concat({t: returns_by_ticker[t] for t in top}, axis=1).dropna()
+    if len(returns) < 2:
+        print("\nNot enough overlapping history for --risk.")
+        return
+
+    weights = [1.0 / len(top)] * len(top)
+    stats = portfolio_stats(returns, weights)
+    table = risk_report(returns, horizons=args.risk_horizons, n_paths=args.risk_paths, seed=args.seed)
+
+    print(f"\nRisk for equal-weight basket: {', '.join(top)} ({len(returns)} days of history)")
+    print(f"- Annualized return: {stats['AnnReturn%']:.1f}%  volatility: {stats['AnnVol%']:.1f}%")
+    print(table.to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
 def main():
     args = parse_args()
     provider = YahooProvider()
 
+    if args.sweep:
+        sweep(args, provider)
+        return
+
+    if args.where or args.score:
+        screen(args, provider)
+        return
+
+    # --risk wants a year of returns to estimate the covariance / bootstrap from
+    windows = (args.ma_fast, args.ma_slow, 21) + ((TRADING_DAYS + 1,) if args.risk else ())
+    start = plan_start(args, windows=windows)
+
+    cache = None if args.no_cache else FeatureCache()
+    spec = {"features": "screener", "windows": [args.ma_fast, args.ma_slow], "vol_window": 20,
+            "version": INDICATORS_VERSION}
+
     results = []
+    returns_by_ticker = {}
     for t in args.tickers:
         try:
-            df = provider.get_price_data(t, period=args.period, interval=args.interval)
+            df = provider.get_price_data(t, period=args.period, interval=args.interval, start=start)
 
             if df is None or df.empty or len(df) < args.min_rows:
                 results.append({"Ticker": t, "Error": "Not enough data"})
                 continue
 
-            df = add_moving_averages(df, windows=(20, 50))
-            df = add_returns(df)
-            df = add_rolling_volatility(df, window=20)
+            if cache is None:
+                df = add_indicators(df, ma_fast=args.ma_fast, ma_slow=args.ma_slow)
+            else:
+                df = cache.get_or_compute(
+                    df, spec, lambda d: add_indicators(d, ma_fast=args.ma_fast, ma_slow=args.ma_slow)
+                )
 
             row = {"Ticker": t}
-            row.update(score_ticker(df))
+            row.update(score_ticker(df, ma_fast=args.ma_fast, ma_slow=args.ma_slow, vol_cutoff=args.vol_cutoff))
             results.append(row)
+            returns_by_ticker[t] = df["Return"]
 
         except Exception as e:
             results.append({"Ticker": t, "Error": str(e)})
@@ -130,10 +320,14 @@ def main():
         print(f"\n✅ Saved results to {args.out}")
 
     # Pretty print
-    cols = ["Ticker", "Close", "AboveMA20", "AboveMA50", "MA20>MA50", "Vol20%", "Score", "Error"]
+    fast_col, slow_col = f"MA{args.ma_fast}", f"MA{args.ma_slow}"
+    cols = ["Ticker", "Close", f"Above{fast_col}", f"Above{slow_col}", f"{fast_col}>{slow_col}", "Vol20%", "Score", "Error"]
     cols = [c for c in cols if c in out.columns]
     print(out[cols].to_string(index=False))
 
+    if args.risk:
+        print_risk(args, returns_by_ticker, out)
+
 
 if __name__ == "__main__":
     main()
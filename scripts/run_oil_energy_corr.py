@@ -1,8 +1,11 @@
 # from pathlib import Path
 
+import argparse
 import sys
 from pathlib import Path
 
+import pandas as pd
+
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
@@ -13,21 +16,93 @@ from src.research.oil_energy_correlation import (
     save_outputs,
     plot_rolling_corr,
     plot_scatter,
+    CorrState,
+    load_state,
+    save_state,
+    incremental_update,
+    append_outputs,
 )
+from src.research.correlation_bootstrap import bootstrap_correlations, save_bootstrap_outputs
 
-def main():
-    cfg = OilEnergyConfig(start="2015-01-01", rolling_window=60)
-    prices, returns, corr = correlation_report(cfg)
-    roll = rolling_correlations(returns, cfg.rolling_window)
+# python scripts/run_oil_energy_corr.py                  full rebuild (re-downloads from 2015)
+# python scripts/run_oil_energy_corr.py --incremental    daily job: only new bars, appends to the CSVs
+# python scripts/run_oil_energy_corr.py --bootstrap 2000 confidence intervals next to the CSVs
+def parse_args():
+    p = argparse.ArgumentParser(description="Oil vs energy ETF correlation research")
+    p.add_argument("--incremental", action="store_true",
+                   help="Extend the saved outputs with bars after the last processed date (full run if no state)")
+    p.add_argument("--plots", action="store_true",
+                   help="With --incremental, also redraw the PNGs from the saved CSVs")
+    p.add_argument("--bootstrap", type=int, default=0,
+                   help="Block-bootstrap resamples for correlation confidence intervals (0 = off)")
+    p.add_argument("--block", type=int, default=20, help="Block length in days for the full-period bootstrap")
+    p.add_argument("--alpha", type=float, default=0.05, help="1 - confidence level. Default: 0.05 (95%% CI)")
+    p.add_argument("--seed", type=int, default=0, help="Bootstrap seed (same seed => same intervals)")
+    p.add_argument("--workers", type=int, default=None, help="Bootstrap worker processes (default: CPU count)")
+    return p.parse_args()
 
-    out_dir = Path("outputs/oil_energy_corr")
-    save_outputs(out_dir, prices, returns, corr, roll)
 
-    # Save charts too
-    plot_rolling_corr(roll, cfg.rolling_window, out_dir / "rolling_corr.png")
+def save_charts(out_dir: Path, returns, roll, window: int) -> None:
+    plot_rolling_corr(roll, window, out_dir / "rolling_corr.png")
     if "WTI" in returns.columns and "VDE" in returns.columns:
         plot_scatter(returns, "WTI", "VDE", out_dir / "wti_vs_vde_scatter.png")
 
+
+def main():
+    args = parse_args()
+    cfg = OilEnergyConfig(start="2015-01-01", rolling_window=60)
+    out_dir = Path("outputs/oil_energy_corr")
+
+    state = load_state(out_dir) if args.incremental else None
+    update = None
+    if state is not None and state.matches(cfg):
+        update = incremental_update(state)
+        if update is None:
+            print(f"Prices on {state.last_date.date()} changed since the last run "
+                  "(dividend/split adjustment or a partial bar), running a full rebuild.")
+
+    if update is not None:
+        prices, returns, corr, roll = update
+        if returns.empty:
+            print(f"Already up to date (last date {state.last_date.date()}).")
+        else:
+            append_outputs(out_dir, prices, returns, corr, roll)
+            save_state(out_dir, state)
+            print(f"Appended {len(returns)} new rows through {state.last_date.date()}.")
+
+        if args.plots:
+            returns = pd.read_csv(out_dir / "returns.csv", index_col=0, parse_dates=True)
+            roll = pd.read_csv(out_dir / "rolling_correlation.csv", index_col=0, parse_dates=True)
+            save_charts(out_dir, returns, roll, cfg.rolling_window)
+    else:
+        if args.incremental and (state is None or not state.matches(cfg)):
+            print("No matching incremental state, running a full rebuild.")
+        prices, returns, corr = correlation_report(cfg)
+        roll = rolling_correlations(returns, cfg.rolling_window)
+
+        save_outputs(out_dir, prices, returns, corr, roll)
+        save_state(out_dir, CorrState.from_returns(cfg, prices, returns))
+
+        # Save charts too
+        save_charts(out_dir, returns, roll, cfg.rolling_window)
+
+    if args.bootstrap > 0:
+        if args.incremental:
+            # Only the new rows are in memory; the intervals need the whole history
+            returns = pd.read_csv(out_dir / "returns.csv", index_col=0, parse_dates=True)
+        corr_ci, roll_ci = bootstrap_correlations(
+            returns,
+            cfg.rolling_window,
+            n_resamples=args.bootstrap,
+            block=args.block,
+            alpha=args.alpha,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        save_bootstrap_outputs(out_dir, corr_ci, roll_ci)
+        print(f"\n=== Bootstrap {1 - args.alpha:.0%} intervals ({args.bootstrap} resamples) ===")
+        print(corr_ci.round(3).to_string(index=False))
+
     print("\n=== Full-period correlation (daily returns) ===")
     print(corr.round(3))
     print(f"\nSaved outputs to: {out_dir.resolve()}")
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(".cache") / "features"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Eviction trims to this fraction of max_bytes, so a full cache rescans every few puts, not every put
+EVICT_TO = 0.9
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Content hash of a price slice: index, column names and every value.
+    Uses pandas' vectorized row hashing, so it is cheap even for long histories.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([str(c) for c in df.columns]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class FeatureCache:
+    """
+    On-disk memo of computed feature frames, keyed by hash(price slice + feature spec).
+
+    The spec should hold everything that changes the output: windows, horizon and a
+    version number bumped whenever the feature code changes. Entries are evicted
+    least-recently-used first (file mtime is the clock) once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes: int | None = None  # running size of the entries; scanned once, lazily
+
+    def key(self, df: pd.DataFrame, spec: dict) -> str:
+        h = hashlib.sha256()
+        h.update(frame_digest(df).encode())
+        h.update(json.dumps(spec, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        path = self._path(key)
+        try:
+            df = pd.read_pickle(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated file or written by an incompatible pandas/numpy: treat as a miss
+            self._remove(path)
+            return None
+        os.utime(path)  # mark as recently used
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        total = self._total()
+        path = self._path(key)
+        tmp = path.with_suffix(".tmp")
+        df.to_pickle(tmp)
+        size = tmp.stat().st_size
+        replaced = self._size_of(path)
+        os.replace(tmp, path)  # atomic, so a crashed run never leaves a half-written entry
+        self._bytes = total - replaced + size
+        if self._bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """
+        Deletes least-recently-used entries until the cache fits in EVICT_TO * max_bytes.
+        Rescans the directory, which also resyncs the running total.
+        """
+        entries = [(p.stat(), p) for p in self.cache_dir.glob("*.pkl")]
+        total = sum(st.st_size for st, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for st, path in sorted(entries, key=lambda e: e[0].st_mtime):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+        self._bytes = total
+
+    def _total(self) -> int:
+        if self._bytes is None:
+            self._bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.pkl"))
+        return self._bytes
+
+    @staticmethod
+    def _size_of(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _remove(self, path: Path) -> None:
+        size = self._size_of(path)
+        path.unlink(missing_ok=True)
+        if self._bytes is not None:
+            self._bytes = max(0, self._bytes - size)
+
+    def get_or_compute(
+        self,
+        df: pd.DataFrame,
+        spec: dict,
+        compute: Callable[[pd.DataFrame], pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        Returns compute(df), reusing the stored result when neither the prices nor the spec changed.
+        """
+        key = self.key(df, spec)
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        out = compute(df)
+        self.put(key, out)
+        return out
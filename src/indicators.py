@@ -1,7 +1,21 @@
+import numpy as np
 import pandas as pd
 
 TRADING_DAYS = 252
 
+def pack_valid(a: np.ndarray, at: str = "top") -> np.ndarray:
+    """
+    Moves each column's non-NaN values to the top (or bottom) of a (dates x tickers) array,
+    in date order, NaN-padded on the other side. Rows then count each ticker's own bars,
+    not union-calendar rows, so tickers on exchanges with different holidays line up.
+    One stable argsort, no per-ticker loop.
+    """
+    if at not in ("top", "bottom"):
+        raise ValueError(f"at must be 'top' or 'bottom', got {at!r}")
+    missing = np.isnan(a)
+    order = np.argsort(missing if at == "top" else ~missing, axis=0, kind="stable")
+    return np.take_along_axis(a, order, axis=0)
+
 def add_returns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Adds daily percent returns.
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from src.indicators import TRADING_DAYS
+
+# How many bars one trading day produces, per yfinance interval (US session = 6.5h)
+BARS_PER_DAY = {
+    "1m": 390, "2m": 195, "5m": 78, "15m": 26, "30m": 13,
+    "60m": 6.5, "1h": 6.5, "90m": 13 / 3,
+    "1d": 1, "5d": 1 / 5, "1wk": 1 / 5, "1mo": 1 / 21, "3mo": 1 / 63,
+}
+
+# Extra calendar days on top of the weekend conversion, for exchange holidays
+HOLIDAY_PAD_DAYS = 10
+
+
+@dataclass(frozen=True)
+class LookbackPlan:
+    """
+    Minimum history a run needs.
+    bars  = trading bars to request (warm-up margin included)
+    start = first calendar date to request, as YYYY-MM-DD (pass to get_price_data(start=...))
+    """
+    bars: int
+    start: str
+
+    def describe(self) -> str:
+        return f"{self.bars} bars from {self.start}"
+
+
+def required_bars(windows=(), horizon: int = 0, min_rows: int = 0) -> int:
+    """
+    Bars needed before warm-up: the longest indicator window plus the label/forward horizon,
+    or --min_rows if that is larger.
+    Windows are in bars; pass window + 1 for anything computed on returns (Volatility20 needs 21 closes).
+    """
+    longest = max(windows, default=1)
+    return max(longest + horizon, min_rows, 1)
+
+
+def plan_lookback(
+    windows=(),
+    horizon: int = 0,
+    min_rows: int = 0,
+    interval: str = "1d",
+    margin: float = 0.10,
+    today: date | None = None,
+) -> LookbackPlan:
+    """
+    Turns indicator windows / horizon / min_rows into the smallest request that still
+    leaves every indicator warmed up on the first row we actually use.
+    `margin` is a fraction of extra bars (10% default) against halts and missing bars.
+    """
+    if interval not in BARS_PER_DAY:
+        raise ValueError(f"Unknown interval '{interval}'. Expected one of: {', '.join(BARS_PER_DAY)}")
+
+    bars = math.ceil(required_bars(windows, horizon, min_rows) * (1 + margin))
+    trading_days = bars / BARS_PER_DAY[interval]
+    calendar_days = math.ceil(trading_days * 365 / TRADING_DAYS) + HOLIDAY_PAD_DAYS
+
+    today = today or date.today()
+    return LookbackPlan(bars=bars, start=(today - timedelta(days=calendar_days)).isoformat())
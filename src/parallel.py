@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """
+    Everything a worker process needs to re-attach to a shared array.
+    Small and picklable, so it is what gets sent to the pool instead of the data.
+    """
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+def share_array(arr: np.ndarray) -> tuple[shared_memory.SharedMemory, SharedArraySpec]:
+    """
+    Copies `arr` into a new shared memory block.
+    The caller owns the block and must close() + unlink() it when the pool is done.
+    """
+    arr = np.ascontiguousarray(arr)
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    return shm, SharedArraySpec(name=shm.name, shape=arr.shape, dtype=arr.dtype.str)
+
+
+def attach_array(spec: SharedArraySpec) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Attaches to a block created by share_array() (read-only view, no copy).
+    Keep the returned SharedMemory referenced for as long as the array is used.
+    """
+    shm = shared_memory.SharedMemory(name=spec.name)
+    arr = np.ndarray(spec.shape, dtype=np.dtype(spec.dtype), buffer=shm.buf)
+    arr.flags.writeable = False
+    return shm, arr
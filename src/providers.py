@@ -1,10 +1,23 @@
 import pandas as pd
 
 class PriceDataProvider:
+    """
+    Every provider returns frames in the shared schema from src/schema.py
+    (float32 OHLC by default, or price_dtype="float64"; uint64 Volume; tz-naive Date index).
+    Volume has no NaN: a missing value is stored as 0, so readers should treat 0 as possibly unknown.
+    """
+
+    def __init__(self, price_dtype: str = "float32"):
+        self.price_dtype = price_dtype
+
     def get_price_data(
         self,
         ticker: str,
         period: str = "1y",
-        interval: str = "1d"
+        interval: str = "1d",
+        start: str | None = None,
     ) -> pd.DataFrame:
+        """
+        `start` (YYYY-MM-DD) overrides `period` when given; see src/lookback.py.
+        """
         raise NotImplementedError
\ No newline at end of file
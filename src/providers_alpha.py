@@ -2,18 +2,26 @@ import os
 import requests
 import pandas as pd
 from src.providers import PriceDataProvider
+from src.schema import normalize_price_frame
 
 class AlphaVantageProvider(PriceDataProvider):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, price_dtype: str = "float32"):
+        super().__init__(price_dtype=price_dtype)
         self.api_key = api_key
 
-    def get_price_data(self, ticker: str, period="1y", interval="1d") -> pd.DataFrame:
+    # "compact" returns the latest 100 daily bars; anything older needs the (much larger) "full" payload
+    COMPACT_BARS = 100
+
+    def get_price_data(self, ticker: str, period="1y", interval="1d", start: str | None = None) -> pd.DataFrame:
         url = "https://www.alphavantage.co/query"
+        outputsize = "compact"
+        if start and pd.bdate_range(start, pd.Timestamp.today()).size > self.COMPACT_BARS:
+            outputsize = "full"
         params = {
             "function": "TIME_SERIES_DAILY_ADJUSTED",
             "symbol": ticker,
             "apikey": self.api_key,
-            "outputsize": "compact",
+            "outputsize": outputsize,
         }
 
         r = requests.get(url, params=params)
@@ -27,9 +35,14 @@ class AlphaVantageProvider(PriceDataProvider):
                 "2. high": "High",
                 "3. low": "Low",
                 "4. close": "Close",
+                "5. adjusted close": "Adj Close",
                 "6. volume": "Volume",
             })
         )
 
         df.index = pd.to_datetime(df.index)
-        return df.sort_index()
\ No newline at end of file
+        df = df.sort_index()
+        if start:
+            df = df.loc[start:]
+        # Drops the dividend / split-coefficient columns and applies the shared dtypes
+        return normalize_price_frame(df, price_dtype=self.price_dtype)
\ No newline at end of file
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.parallel import SharedArraySpec, attach_array, share_array
+from src.research.oil_energy_correlation import ROLLING_PAIRS
+
+# Resamples per pool task. Fixed (not derived from the worker count) so that a given
+# seed produces the same intervals on any machine.
+TASK_SIZE = 25
+
+# Soft cap on the temporary arrays one task builds at a time
+BATCH_BYTES = 64 * 1024 * 1024
+
+# Worker-side handle to the shared returns matrix (set once per process by _init_worker)
+_RETURNS: np.ndarray | None = None
+_RETURNS_SHM = None
+
+
+def _init_worker(spec: SharedArraySpec) -> None:
+    global _RETURNS, _RETURNS_SHM
+    _RETURNS_SHM, _RETURNS = attach_array(spec)
+
+
+def block_indices(rng: np.random.Generator, n: int, block: int, size: int) -> np.ndarray:
+    """
+    Moving-block bootstrap: `size` resamples of positions 0..n-1, each built from
+    random contiguous blocks of length `block` (keeps short-range autocorrelation).
+    Returns a (size x n) int array.
+    """
+    block = max(1, min(block, n))
+    n_blocks = math.ceil(n / block)
+    starts = rng.integers(0, n - block + 1, size=(size, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)).reshape(size, -1)
+    return idx[:, :n]
+
+
+def _full_corr_task(n_resamples: int, block: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """
+    Upper-triangle correlations of `n_resamples` block-bootstrapped copies of the shared
+    returns matrix, as a (n_resamples x pairs) float32 array.
+    """
+    x = _RETURNS
+    n, k = x.shape
+    iu = np.triu_indices(k, k=1)
+    rng = np.random.default_rng(seed)
+
+    out = np.empty((n_resamples, len(iu[0])), dtype=np.float32)
+    for i, idx in enumerate(block_indices(rng, n, block, n_resamples)):
+        sample = x[idx]
+        sample = sample - sample.mean(axis=0)
+        cov = sample.T @ sample
+        d = np.sqrt(np.diag(cov))
+        out[i] = (cov / np.outer(d, d))[iu]
+    return out
+
+
+def _rolling_corr_task(
+    pairs: list[tuple[int, int]],
+    window: int,
+    n_resamples: int,
+    block: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Rolling correlation of each column pair for `n_resamples` resamples.
+    Every window is resampled with the same within-window block offsets, so one
+    fancy-index per batch covers all windows at once.
+    Returns (pairs x n_resamples x n_windows) float32.
+    """
+    x = _RETURNS
+    rng = np.random.default_rng(seed)
+    offsets = block_indices(rng, window, block, n_resamples)
+    n_windows = x.shape[0] - window + 1
+
+    out = np.empty((len(pairs), n_resamples, n_windows), dtype=np.float32)
+    batch = max(1, BATCH_BYTES // (2 * n_windows * window * 8))
+    for p, (ia, ib) in enumerate(pairs):
+        wa = sliding_window_view(x[:, ia], window)
+        wb = sliding_window_view(x[:, ib], window)
+        for lo in range(0, n_resamples, batch):
+            idx = offsets[lo:lo + batch]
+            a = wa[:, idx]  # (n_windows, batch, window)
+            b = wb[:, idx]
+            a = a - a.mean(axis=-1, keepdims=True)
+            b = b - b.mean(axis=-1, keepdims=True)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = (a * b).sum(-1) / np.sqrt((a * a).sum(-1) * (b * b).sum(-1))
+            out[p, lo:lo + len(idx)] = r.T
+    return out
+
+
+def _tasks(n_resamples: int, seed: np.random.SeedSequence) -> list[tuple[int, np.random.SeedSequence]]:
+    sizes = [min(TASK_SIZE, n_resamples - lo) for lo in range(0, n_resamples, TASK_SIZE)]
+    return list(zip(sizes, seed.spawn(len(sizes))))
+
+
+def bootstrap_correlations(
+    returns: pd.DataFrame,
+    window: int,
+    n_resamples: int = 1000,
+    block: int = 20,
+    rolling_block: int | None = None,
+    alpha: float = 0.05,
+    seed: int | None = 0,
+    workers: int | None = None,
+    pairs=ROLLING_PAIRS,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Block-bootstrap (1 - alpha) confidence intervals for
+      - every pair of the full-period correlation matrix -> tidy (a, b, corr, lower, upper)
+      - each rolling correlation in `pairs` -> "<a> vs <b> lower/upper" columns by date
+
+    Resamples are split into fixed-size tasks with SeedSequence-spawned seeds and run on a
+    process pool; workers read the returns from shared memory. Same seed => same output,
+    whatever the worker count.
+    `rolling_block` defaults to a quarter of the window.
+    """
+    returns = returns.dropna()
+    cols = list(returns.columns)
+    x = returns.to_numpy(dtype=np.float64)
+    rolling_block = rolling_block or max(1, window // 4)
+    pair_idx = [(cols.index(a), cols.index(b)) for a, b in pairs if a in cols and b in cols]
+    pair_names = [f"{cols[a]} vs {cols[b]}" for a, b in pair_idx]
+    do_rolling = bool(pair_idx) and len(x) >= window
+
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    full_tasks = _tasks(n_resamples, seeds[0])
+    roll_tasks = _tasks(n_resamples, seeds[1]) if do_rolling else []
+    workers = workers or os.cpu_count() or 1
+
+    shm, spec = share_array(x)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            full_futs = [pool.submit(_full_corr_task, size, block, s) for size, s in full_tasks]
+            roll_futs = [pool.submit(_rolling_corr_task, pair_idx, window, size, rolling_block, s)
+                         for size, s in roll_tasks]
+            full = np.vstack([f.result() for f in full_futs])
+            roll = np.concatenate([f.result() for f in roll_futs], axis=1) if roll_futs else None
+    finally:
+        shm.close()
+        shm.unlink()
+
+    q = [alpha / 2, 1 - alpha / 2]
+    point = returns.corr().to_numpy()
+    iu = np.triu_indices(len(cols), k=1)
+    lower, upper = np.nanquantile(full, q, axis=0)
+    corr_ci = pd.DataFrame({
+        "a": np.asarray(cols)[iu[0]],
+        "b": np.asarray(cols)[iu[1]],
+        "corr": point[iu],
+        "lower": lower,
+        "upper": upper,
+    })
+
+    roll_ci = pd.DataFrame(index=returns.index)
+    if roll is not None:
+        lo_q, hi_q = np.nanquantile(roll, q, axis=1)  # (pairs x n_windows) each
+        dates = returns.index[window - 1:]
+        for p, name in enumerate(pair_names):
+            roll_ci[f"{name} lower"] = pd.Series(lo_q[p], index=dates)
+            roll_ci[f"{name} upper"] = pd.Series(hi_q[p], index=dates)
+    return corr_ci, roll_ci
+
+
+def save_bootstrap_outputs(out_dir: str | Path, corr_ci: pd.DataFrame, roll_ci: pd.DataFrame) -> None:
+    """
+    Written next to correlation_matrix.csv / rolling_correlation.csv.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    corr_ci.to_csv(out_dir / "correlation_ci.csv", index=False)
+    roll_ci.to_csv(out_dir / "rolling_correlation_ci.csv")
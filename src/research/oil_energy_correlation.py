@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -51,15 +52,17 @@ def correlation_report(
     return prices, returns, corr
 
 
+ROLLING_PAIRS = [
+    ("WTI", "VDE"),
+    ("WTI", "XLE"),
+    ("Brent", "VDE"),
+    ("Brent", "XLE"),
+]
+
+
 def rolling_correlations(returns: pd.DataFrame, window: int) -> pd.DataFrame:
-    pairs = [
-        ("WTI", "VDE"),
-        ("WTI", "XLE"),
-        ("Brent", "VDE"),
-        ("Brent", "XLE"),
-    ]
     out = pd.DataFrame(index=returns.index)
-    for a, b in pairs:
+    for a, b in ROLLING_PAIRS:
         if a in returns.columns and b in returns.columns:
             out[f"{a} vs {b}"] = returns[a].rolling(window).corr(returns[b])
     return out
@@ -109,4 +112,146 @@ def plot_scatter(returns: pd.DataFrame, x: str, y: str, out_path: str | Path | N
     if out_path:
         plt.savefig(out_path, dpi=160)
     else:
-        plt.show()
\ No newline at end of file
+        plt.show()
+
+
+# --- Incremental (daily) refresh -------------------------------------------------------
+
+STATE_FILE = "state.pkl"
+
+
+@dataclass
+class CorrState:
+    """
+    Everything needed to extend the outputs without re-reading history:
+      last_date     last processed trading date
+      last_prices   price row on last_date (seed for the next pct_change / ffill)
+      returns_tail  last (rolling_window - 1) return rows (seed for rolling_correlations)
+      n, sums, cross  running moments of returns (count, column sums, X'X) for the full-period matrix
+    """
+    tickers: dict[str, str]
+    rolling_window: int
+    last_date: pd.Timestamp
+    last_prices: pd.Series
+    returns_tail: pd.DataFrame
+    n: int
+    sums: np.ndarray
+    cross: np.ndarray
+
+    @classmethod
+    def from_returns(cls, cfg: OilEnergyConfig, prices: pd.DataFrame, returns: pd.DataFrame) -> "CorrState":
+        x = returns.to_numpy(dtype=np.float64)
+        return cls(
+            tickers=dict(cfg.tickers),
+            rolling_window=cfg.rolling_window,
+            last_date=prices.index[-1],
+            last_prices=prices.iloc[-1],
+            returns_tail=returns.iloc[-(cfg.rolling_window - 1):] if cfg.rolling_window > 1 else returns.iloc[:0],
+            n=len(x),
+            sums=x.sum(axis=0),
+            cross=x.T @ x,
+        )
+
+    def matches(self, cfg: OilEnergyConfig) -> bool:
+        return self.tickers == dict(cfg.tickers) and self.rolling_window == cfg.rolling_window
+
+    def update(self, prices: pd.DataFrame, returns: pd.DataFrame) -> None:
+        x = returns.to_numpy(dtype=np.float64)
+        self.n += len(x)
+        self.sums = self.sums + x.sum(axis=0)
+        self.cross = self.cross + x.T @ x
+        self.last_date = prices.index[-1]
+        self.last_prices = prices.iloc[-1]
+        tail = pd.concat([self.returns_tail, returns])
+        self.returns_tail = tail.iloc[-(self.rolling_window - 1):] if self.rolling_window > 1 else tail.iloc[:0]
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Full-period Pearson matrix from the running moments; equals returns.corr() over all rows seen.
+        """
+        mean = self.sums / self.n
+        cov = (self.cross - self.n * np.outer(mean, mean)) / (self.n - 1)
+        std = np.sqrt(np.diag(cov))
+        cols = self.last_prices.index
+        return pd.DataFrame(cov / np.outer(std, std), index=cols, columns=cols)
+
+
+def load_state(out_dir: str | Path) -> CorrState | None:
+    path = Path(out_dir) / STATE_FILE
+    return pd.read_pickle(path) if path.exists() else None
+
+
+def save_state(out_dir: str | Path, state: CorrState) -> None:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pd.to_pickle(state, out_dir / STATE_FILE)
+
+
+# Relative tolerance when comparing the re-fetched last_date row with the stored one
+OVERLAP_RTOL = 1e-6
+
+
+def incremental_update(
+    state: CorrState,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame] | None:
+    """
+    Fetches bars from state.last_date on and extends every output by the new rows.
+    Returns (new prices, new returns, full-period correlation, new rolling rows); the new
+    frames are empty when there is nothing to add. `state` is updated in place.
+
+    The last_date row is fetched again and must match the stored one. With auto-adjusted
+    prices a dividend / split rescales all earlier closes, and a run during market hours
+    stores a partial bar; in both cases the history on disk is stale, so this returns None
+    and the caller should do a full rebuild.
+    """
+    symbols = list(state.tickers.values())
+    fetched = download_prices(symbols, start=state.last_date.strftime("%Y-%m-%d"))
+
+    inv = {v: k for k, v in state.tickers.items()}
+    fetched = fetched.rename(columns=inv).reindex(columns=state.last_prices.index)
+    if fetched.empty:
+        empty = fetched.iloc[:0]
+        return empty, empty, state.correlation(), pd.DataFrame()
+
+    if state.last_date not in fetched.index:
+        return None
+    overlap = fetched.loc[state.last_date]
+    known = overlap.notna()
+    stored = state.last_prices.astype(np.float64)
+    if not np.allclose(overlap[known], stored[known], rtol=OVERLAP_RTOL, atol=0.0):
+        return None
+
+    fetched = fetched[fetched.index > state.last_date]
+    if fetched.empty:
+        empty = fetched.iloc[:0]
+        return empty, empty, state.correlation(), pd.DataFrame()
+
+    # Seed with the re-fetched last_date row (stored values only where Yahoo has a gap)
+    # so ffill + pct_change behave as in a full run
+    seed = overlap.fillna(stored).rename(state.last_date)
+    prices = pd.concat([seed.to_frame().T, fetched]).ffill()
+    returns = compute_returns(prices)
+    prices = prices.iloc[1:]
+
+    window = pd.concat([state.returns_tail, returns])
+    roll = rolling_correlations(window, state.rolling_window).iloc[-len(returns):]
+
+    state.update(prices, returns)
+    return prices, returns, state.correlation(), roll
+
+
+def append_outputs(
+    out_dir: str | Path,
+    prices: pd.DataFrame,
+    returns: pd.DataFrame,
+    corr: pd.DataFrame,
+    roll: pd.DataFrame,
+) -> None:
+    """
+    Appends the new rows to the CSVs written by save_outputs (the small matrix is rewritten).
+    """
+    out_dir = Path(out_dir)
+    prices.to_csv(out_dir / "prices.csv", mode="a", header=False)
+    returns.to_csv(out_dir / "returns.csv", mode="a", header=False)
+    roll.to_csv(out_dir / "rolling_correlation.csv", mode="a", header=False)
+    corr.to_csv(out_dir / "correlation_matrix.csv")
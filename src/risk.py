@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import TRADING_DAYS
+
+
+def portfolio_stats(returns: pd.DataFrame, weights: np.ndarray) -> dict:
+    """
+    Annualized mean / volatility of the weighted portfolio from daily returns.
+    """
+    port = returns.to_numpy() @ weights
+    return {
+        "AnnReturn%": float(port.mean() * TRADING_DAYS * 100),
+        "AnnVol%": float(port.std(ddof=1) * (TRADING_DAYS ** 0.5) * 100),
+    }
+
+
+def check_horizons(horizons) -> list[int]:
+    """
+    Sorted, de-duplicated horizons in trading days; each must be >= 1.
+    """
+    horizons = sorted(set(int(h) for h in horizons))
+    if not horizons or horizons[0] < 1:
+        raise ValueError(f"Horizons must be whole trading days >= 1, got {horizons}")
+    return horizons
+
+
+def check_paths(n_paths: int, chunk_size: int) -> None:
+    """
+    Both must be >= 1: no paths means no table, and a zero chunk would never finish.
+    """
+    if n_paths < 1 or chunk_size < 1:
+        raise ValueError(f"n_paths and chunk_size must be >= 1, got {n_paths} and {chunk_size}")
+
+
+def _chunks(n_paths: int, chunk_size: int):
+    done = 0
+    while done < n_paths:
+        size = min(chunk_size, n_paths - done)
+        yield size
+        done += size
+
+
+def _walk(step_returns, size: int, horizons: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compounds one chunk of paths day by day.
+    step_returns(size) -> (size,) portfolio returns for the next day.
+    Returns (size x horizons) cumulative returns and max drawdowns at each horizon.
+    Memory is O(size), independent of the horizon and the number of assets.
+    """
+    wealth = np.ones(size)
+    peak = np.ones(size)
+    max_dd = np.zeros(size)
+    cum = np.empty((size, len(horizons)))
+    dd = np.empty((size, len(horizons)))
+
+    h_idx = 0
+    for day in range(1, horizons[-1] + 1):
+        wealth *= 1.0 + step_returns(size)
+        np.maximum(peak, wealth, out=peak)
+        np.maximum(max_dd, 1.0 - wealth / peak, out=max_dd)
+        while h_idx < len(horizons) and horizons[h_idx] == day:
+            cum[:, h_idx] = wealth - 1.0
+            dd[:, h_idx] = max_dd
+            h_idx += 1
+    return cum, dd
+
+
+def simulate_monte_carlo(
+    returns: pd.DataFrame,
+    weights: np.ndarray,
+    horizons=(1, 5, 21),
+    n_paths: int = 100_000,
+    chunk_size: int = 50_000,
+    seed: int | np.random.SeedSequence | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gaussian Monte Carlo with the assets' sample mean and covariance.
+    Correlated daily returns = mu + L @ z, with L the Cholesky factor of the covariance.
+    Weights are fixed, so the portfolio return w @ (mu + L @ z) is exactly
+    N(w @ mu, |L.T @ w|^2): one draw per path-day instead of one per asset-day,
+    same distribution, ~n_assets times fewer random numbers.
+    Paths are generated `chunk_size` at a time; returns (n_paths x horizons) arrays of
+    cumulative portfolio returns and max drawdowns.
+    """
+    horizons = check_horizons(horizons)
+    check_paths(n_paths, chunk_size)
+    x = returns.to_numpy(dtype=np.float64)
+    mu = x.mean(axis=0)
+    cov = np.cov(x, rowvar=False).reshape(len(mu), len(mu))
+    # Tiny ridge keeps Cholesky happy for near-duplicate tickers (e.g. two share classes)
+    chol = np.linalg.cholesky(cov + np.eye(len(mu)) * 1e-12)
+    port_mu = float(mu @ weights)
+    port_sigma = float(np.linalg.norm(chol.T @ weights))
+    rng = np.random.default_rng(seed)
+
+    def step(size):
+        return port_mu + port_sigma * rng.standard_normal(size)
+
+    cum, dd = [], []
+    for size in _chunks(n_paths, chunk_size):
+        c, d = _walk(step, size, horizons)
+        cum.append(c)
+        dd.append(d)
+    return np.vstack(cum), np.vstack(dd)
+
+
+def simulate_bootstrap(
+    returns: pd.DataFrame,
+    weights: np.ndarray,
+    horizons=(1, 5, 21),
+    n_paths: int = 100_000,
+    chunk_size: int = 50_000,
+    seed: int | np.random.SeedSequence | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Historical bootstrap: each simulated day is a whole historical day drawn with replacement,
+    so cross-asset correlation and fat tails come from the data itself.
+    Same outputs as simulate_monte_carlo.
+    """
+    horizons = check_horizons(horizons)
+    check_paths(n_paths, chunk_size)
+    port = returns.to_numpy(dtype=np.float64) @ weights
+    rng = np.random.default_rng(seed)
+
+    def step(size):
+        return port[rng.integers(0, len(port), size)]
+
+    cum, dd = [], []
+    for size in _chunks(n_paths, chunk_size):
+        c, d = _walk(step, size, horizons)
+        cum.append(c)
+        dd.append(d)
+    return np.vstack(cum), np.vstack(dd)
+
+
+def risk_table(cum: np.ndarray, dd: np.ndarray, horizons, confidence: float = 0.95, method: str = "") -> pd.DataFrame:
+    """
+    VaR / CVaR (as positive loss fractions) and drawdown quantiles, one row per horizon.
+    """
+    horizons = check_horizons(horizons)
+    rows = []
+    for i, h in enumerate(horizons):
+        losses = -cum[:, i]
+        var = float(np.quantile(losses, confidence))
+        tail = losses[losses >= var]
+        rows.append({
+            "Method": method,
+            "HorizonDays": h,
+            "Paths": len(losses),
+            f"VaR{int(confidence * 100)}%": var * 100,
+            f"CVaR{int(confidence * 100)}%": float(tail.mean()) * 100,
+            "MedianDD%": float(np.median(dd[:, i])) * 100,
+            f"DD{int(confidence * 100)}%": float(np.quantile(dd[:, i], confidence)) * 100,
+        })
+    return pd.DataFrame(rows)
+
+
+def risk_report(
+    returns: pd.DataFrame,
+    weights: np.ndarray | None = None,
+    horizons=(1, 5, 21),
+    n_paths: int = 100_000,
+    confidence: float = 0.95,
+    chunk_size: int = 50_000,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Runs both Monte Carlo and historical bootstrap for a portfolio of daily returns
+    (columns = tickers; equal weight by default) and stacks their risk tables.
+    """
+    horizons = check_horizons(horizons)
+    check_paths(n_paths, chunk_size)
+    returns = returns.dropna()
+    if returns.empty:
+        return pd.DataFrame()
+    if weights is None:
+        weights = np.full(returns.shape[1], 1.0 / returns.shape[1])
+    weights = np.asarray(weights, dtype=np.float64)
+
+    seeds = np.random.SeedSequence(seed).spawn(2)
+    mc = simulate_monte_carlo(returns, weights, horizons, n_paths, chunk_size, seed=seeds[0])
+    bs = simulate_bootstrap(returns, weights, horizons, n_paths, chunk_size, seed=seeds[1])
+    return pd.concat([
+        risk_table(*mc, horizons, confidence, method="MonteCarlo"),
+        risk_table(*bs, horizons, confidence, method="Bootstrap"),
+    ], ignore_index=True)
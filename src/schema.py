@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# The one column layout every provider returns (missing fields are simply absent)
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+PRICE_FIELDS = ["Open", "High", "Low", "Close", "Adj Close"]
+# uint64 has no NaN: a missing/unparseable Volume is stored as 0, so Volume == 0 can mean "unknown"
+VOLUME_DTYPE = np.dtype("uint64")
+INDEX_DTYPE = np.dtype("datetime64[ns]")
+
+
+def is_normalized(df: pd.DataFrame, price_dtype: str = "float32") -> bool:
+    """
+    True if df already follows the schema, so normalize_price_frame can return it untouched.
+    """
+    price_dtype = np.dtype(price_dtype)
+    cols = list(df.columns)
+    if cols != [c for c in PRICE_COLUMNS if c in cols]:
+        return False
+    if df.index.dtype != INDEX_DTYPE or not df.index.is_monotonic_increasing:
+        return False
+    return all(
+        dtype == (VOLUME_DTYPE if col == "Volume" else price_dtype)
+        for col, dtype in df.dtypes.items()
+    )
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    yfinance may return (Price, Ticker) or (Ticker, Price) MultiIndex columns; keep the Price level.
+    """
+    if not isinstance(df.columns, pd.MultiIndex):
+        return df
+    for level in range(df.columns.nlevels):
+        values = df.columns.get_level_values(level)
+        if "Close" in values:
+            return df.set_axis(values, axis=1)
+    # Fallback: join both levels
+    return df.set_axis(["_".join(map(str, col)).strip() for col in df.columns.to_list()], axis=1)
+
+
+def normalize_price_frame(df: pd.DataFrame, price_dtype: str = "float32") -> pd.DataFrame:
+    """
+    Converts any provider output to the shared price schema:
+      columns  Open, High, Low, Close, Adj Close (price_dtype, float32 by default), Volume (uint64),
+               in that order; anything else is dropped. Missing or negative volume becomes 0
+               (uint64 cannot hold NaN), so a 0 Volume may mean "not reported", not "no trades".
+      index    sorted, de-duplicated, tz-naive datetime64[ns] named Date. tz-aware indexes
+               keep their exchange-local wall time (same as yfinance's ignore_tz).
+    float32 prices + uint64 volume take ~40% less memory than float64 + float64.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if is_normalized(df, price_dtype):
+        return df
+
+    df = _flatten_columns(df)
+    df = df.loc[:, [c for c in PRICE_COLUMNS if c in df.columns]]
+
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df = df.set_axis(index.astype(INDEX_DTYPE).rename("Date"), axis=0)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep="last")]
+
+    dtypes = {c: price_dtype for c in PRICE_FIELDS if c in df.columns}
+    out = df.astype(dtypes)
+    if "Volume" in out.columns:
+        volume = pd.to_numeric(out["Volume"], errors="coerce").fillna(0).clip(lower=0).round()
+        out["Volume"] = volume.astype(VOLUME_DTYPE)
+    return out
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import ast
+import re
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import TRADING_DAYS, pack_valid
+
+# Identifiers an expression may use:
+#   Close, Open, High, Low, Volume  latest bar
+#   Return                          latest daily return
+#   MA<n>                           n-day moving average of Close
+#   Vol<n>                          n-day annualized volatility of daily returns (0.3 == 30%)
+#   Ret<n>                          n-day return of Close
+_NAME_RE = re.compile(r"^(?:(Close|Open|High|Low|Volume|Return)|(MA|Vol|Ret)(\d+))$")
+
+_BASE_FIELDS = ("Open", "High", "Low", "Volume")
+
+_BIN_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+_CMP_OPS = {
+    ast.Gt: np.greater,
+    ast.GtE: np.greater_equal,
+    ast.Lt: np.less,
+    ast.LtE: np.less_equal,
+    ast.Eq: np.equal,
+    ast.NotEq: np.not_equal,
+}
+
+Columns = dict[str, np.ndarray]
+
+
+def _lookback(name: str) -> int:
+    """
+    Number of Close bars needed to evaluate `name` on the latest date.
+    """
+    m = _NAME_RE.match(name)
+    if m is None:
+        raise ValueError(f"Unknown indicator '{name}'. Use Close/Open/High/Low/Volume/Return, MA<n>, Vol<n> or Ret<n>.")
+    if m.group(1):
+        return 2 if m.group(1) == "Return" else 1
+    kind, n = m.group(2), int(m.group(3))
+    if n < 1:
+        raise ValueError(f"Window must be >= 1 in '{name}'")
+    return n if kind == "MA" else n + 1
+
+
+def _as_number(x):
+    # numpy treats bool + bool as logical or; scores like (Close > MA20) + (Close > MA50) must count
+    if isinstance(x, np.ndarray) and x.dtype == bool:
+        return x.astype(np.float64)
+    return x
+
+
+@dataclass
+class ScreenExpr:
+    """
+    A filter or score expression, parsed once and compiled to column-wise NumPy calls.
+
+    Example:
+        ScreenExpr("Close > MA50 and Vol20 < 0.3").evaluate(snapshot)
+    returns one bool per ticker (row) of the snapshot.
+    """
+    text: str
+    names: set[str] = field(init=False, default_factory=set)
+    _fn: Callable[[Columns], np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        try:
+            tree = ast.parse(self.text.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression '{self.text}': {e.msg}") from None
+        self._fn = self._compile(tree.body)
+
+    @property
+    def lookback(self) -> int:
+        return max((_lookback(n) for n in self.names), default=1)
+
+    def evaluate(self, columns: Columns | pd.DataFrame) -> np.ndarray:
+        if isinstance(columns, pd.DataFrame):
+            columns = {c: columns[c].to_numpy(dtype=np.float64) for c in columns.columns}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(self._fn(columns))
+
+    def _compile(self, node: ast.AST) -> Callable[[Columns], np.ndarray]:
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(v) for v in node.values]
+            op = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def bool_op(cols):
+                out = parts[0](cols)
+                for p in parts[1:]:
+                    out = op(out, p(cols))
+                return out
+            return bool_op
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand)
+            if isinstance(node.op, ast.Not):
+                return lambda cols: np.logical_not(operand(cols))
+            if isinstance(node.op, ast.USub):
+                return lambda cols: np.negative(_as_number(operand(cols)))
+            if isinstance(node.op, ast.UAdd):
+                return lambda cols: _as_number(operand(cols))
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            left, right, op = self._compile(node.left), self._compile(node.right), _BIN_OPS[type(node.op)]
+            return lambda cols: op(_as_number(left(cols)), _as_number(right(cols)))
+
+        if isinstance(node, ast.Compare) and all(type(o) in _CMP_OPS for o in node.ops):
+            # a < b < c  ==  (a < b) and (b < c)
+            operands = [self._compile(node.left)] + [self._compile(c) for c in node.comparators]
+            ops = [_CMP_OPS[type(o)] for o in node.ops]
+
+            def compare(cols):
+                values = [f(cols) for f in operands]
+                out = ops[0](values[0], values[1])
+                for i in range(1, len(ops)):
+                    out = np.logical_and(out, ops[i](values[i], values[i + 1]))
+                return out
+            return compare
+
+        if isinstance(node, ast.Name):
+            _lookback(node.id)  # validates the identifier
+            self.names.add(node.id)
+            name = node.id
+            return lambda cols: cols[name]
+
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float, bool)):
+            value = node.value
+            return lambda cols: value
+
+        raise ValueError(f"Unsupported syntax in '{self.text}': {ast.unparse(node)}")
+
+
+def _last_valid(panel: pd.DataFrame, k: int) -> np.ndarray:
+    """
+    Last `k` non-NaN values of every column, as a (k x tickers) array.
+    NaN-padded at the top for tickers with shorter history (see pack_valid).
+    """
+    a = panel.to_numpy(dtype=np.float64)
+    tail = pack_valid(a, at="bottom")[-k:]
+    if tail.shape[0] < k:
+        pad = np.full((k - tail.shape[0], a.shape[1]), np.nan)
+        tail = np.vstack([pad, tail])
+    return tail
+
+
+def build_snapshot(frames: dict[str, pd.DataFrame], names: set[str]) -> pd.DataFrame:
+    """
+    One row per ticker with the latest value of each referenced indicator.
+    Only the indicators in `names` are computed, and only over the bars they need.
+    """
+    frames = {t: df for t, df in frames.items() if df is not None and not df.empty}
+    tickers = list(frames)
+    snapshot = pd.DataFrame(index=pd.Index(tickers, name="Ticker"))
+    if not tickers:
+        return snapshot
+
+    k = max((_lookback(n) for n in names), default=1)
+    close = _last_valid(pd.concat({t: df["Close"] for t, df in frames.items()}, axis=1), k)
+
+    for name in sorted(names):
+        m = _NAME_RE.match(name)
+        base, kind = m.group(1), m.group(2)
+        if base == "Close":
+            values = close[-1]
+        elif base == "Return":
+            values = close[-1] / close[-2] - 1.0
+        elif base in _BASE_FIELDS:
+            col = pd.concat({t: df[base] if base in df.columns else pd.Series(dtype=float)
+                             for t, df in frames.items()}, axis=1)
+            values = _last_valid(col, 1)[-1]
+        else:
+            n = int(m.group(3))
+            if kind == "MA":
+                values = close[-n:].mean(axis=0)
+            elif kind == "Ret":
+                values = close[-1] / close[-1 - n] - 1.0
+            else:
+                window = close[-n - 1:]
+                returns = window[1:] / window[:-1] - 1.0
+                values = returns.std(axis=0, ddof=1) * (TRADING_DAYS ** 0.5)
+        snapshot[name] = values
+    return snapshot
+
+
+def run_screen(
+    frames: dict[str, pd.DataFrame],
+    where: str | ScreenExpr | None = None,
+    score: str | ScreenExpr | None = None,
+) -> pd.DataFrame:
+    """
+    Filters the universe with `where` and ranks it by `score` (both optional,
+    as text or already-parsed ScreenExpr).
+    Returns the snapshot rows that pass, with a Score column when `score` is given,
+    best first.
+    """
+    where_expr = ScreenExpr(where) if isinstance(where, str) else where
+    score_expr = ScreenExpr(score) if isinstance(score, str) else score
+    names = set().union(*(e.names for e in (where_expr, score_expr) if e is not None)) or {"Close"}
+
+    snapshot = build_snapshot(frames, names)
+    if snapshot.empty:
+        return snapshot
+
+    out = snapshot
+    if score_expr is not None:
+        out = out.assign(Score=np.broadcast_to(score_expr.evaluate(snapshot), len(snapshot)).astype(np.float64))
+    if where_expr is not None:
+        out = out[np.broadcast_to(where_expr.evaluate(snapshot), len(snapshot)).astype(bool)]
+    if score_expr is not None:
+        out = out.sort_values("Score", ascending=False, na_position="last")
+    return out.reset_index()
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.indicators import TRADING_DAYS, pack_valid
+from src.parallel import SharedArraySpec, attach_array, share_array
+
+# Worker-side handle to the shared Close panel (set once per process by _init_worker)
+_PANEL: np.ndarray | None = None
+_PANEL_SHM = None
+
+
+def build_close_panel(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Aligns the Close column of every ticker on one date index.
+    Returns a float64 DataFrame (dates x tickers); NaN where a ticker has no bar.
+    """
+    closes = {t: df["Close"].astype("float64") for t, df in frames.items() if df is not None and not df.empty}
+    if not closes:
+        return pd.DataFrame()
+    return pd.concat(closes, axis=1).sort_index()
+
+
+def _init_worker(spec: SharedArraySpec) -> None:
+    global _PANEL, _PANEL_SHM
+    _PANEL_SHM, _PANEL = attach_array(spec)
+
+
+def _score_window_pair(
+    fast: int,
+    slow: int,
+    cutoffs: list[float],
+    horizon: int,
+    vol_window: int,
+) -> list[dict]:
+    """
+    Scores every (bar, ticker) cell of the shared, packed panel (see indicators.pack_valid)
+    for one MA pair, then summarises the score distribution + forward returns for each
+    vol cutoff. Same rules as screener.score_ticker, applied to the whole history at once.
+    """
+    close = pd.DataFrame(_PANEL)
+
+    ma_fast = close.rolling(window=fast).mean()
+    ma_slow = close.rolling(window=slow).mean()
+    ret = close.pct_change(fill_method=None)
+    vol = ret.rolling(window=vol_window).std() * (TRADING_DAYS ** 0.5)
+    fwd = close.shift(-horizon) / close - 1.0
+
+    valid = (close.notna() & ma_fast.notna() & ma_slow.notna() & vol.notna()).to_numpy()
+    base = (
+        (close > ma_fast).to_numpy(dtype=np.int8)
+        + (close > ma_slow).to_numpy(dtype=np.int8)
+        + (ma_fast > ma_slow).to_numpy(dtype=np.int8)
+    )[valid]
+    vol_v = vol.to_numpy()[valid]
+    fwd_v = fwd.to_numpy()[valid]
+    total = int(valid.sum())
+
+    rows = []
+    for cutoff in cutoffs:
+        score = base - (vol_v > cutoff).astype(np.int8)
+        for s in np.unique(score):
+            in_bucket = score == s
+            f = fwd_v[in_bucket]
+            f = f[~np.isnan(f)]
+            rows.append({
+                "ma_fast": fast,
+                "ma_slow": slow,
+                "vol_cutoff": cutoff,
+                "Score": int(s),
+                "count": int(in_bucket.sum()),
+                "share": float(in_bucket.sum()) / total,
+                "fwd_count": len(f),
+                "mean_fwd_return": float(f.mean()) if len(f) else np.nan,
+                "median_fwd_return": float(np.median(f)) if len(f) else np.nan,
+                "hit_rate": float((f > 0).mean()) if len(f) else np.nan,
+            })
+    return rows
+
+
+def run_sweep(
+    panel: pd.DataFrame,
+    fast_windows=(10, 20),
+    slow_windows=(50, 100),
+    vol_cutoffs=(0.30, 0.40, 0.50),
+    horizon: int = 5,
+    vol_window: int = 20,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """
+    Evaluates the screener rules for every (fast MA, slow MA, vol cutoff) in the grid
+    over the full Close panel.
+
+    The panel is packed to each ticker's own bars (pack_valid) and copied once into
+    shared memory; each worker process attaches to it, so only the (fast, slow) pair
+    travels to a task instead of pickled DataFrames.
+
+    Returns a tidy table, one row per parameter set and score value, with the share of
+    (bar, ticker) cells at that score and their `horizon`-day forward returns.
+    """
+    pairs = [(f, s) for f, s in itertools.product(sorted(set(fast_windows)), sorted(set(slow_windows))) if f < s]
+    if panel.empty or not pairs:
+        return pd.DataFrame()
+
+    cutoffs = sorted(set(vol_cutoffs))
+    workers = workers or min(len(pairs), os.cpu_count() or 1)
+
+    shm, spec = share_array(pack_valid(panel.to_numpy(dtype="float64"), at="top"))
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec,)) as pool:
+            futures = [
+                pool.submit(_score_window_pair, f, s, cutoffs, horizon, vol_window)
+                for f, s in pairs
+            ]
+            rows = [row for fut in futures for row in fut.result()]
+    finally:
+        shm.close()
+        shm.unlink()
+
+    out = pd.DataFrame(rows)
+    return out.sort_values(["ma_fast", "ma_slow", "vol_cutoff", "Score"], ignore_index=True)